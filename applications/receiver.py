@@ -12,7 +12,9 @@ import json
 import socket
 import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
 # Add module paths
 sys.path.append('01. Encryption Module')
@@ -25,7 +27,7 @@ sys.path.append('06. Optimization Module')
 from a1_encryption import decrypt_message
 from a2_key_management import generate_ecc_keypair, serialize_public_key, serialize_private_key
 from a3_image_processing_color import read_image_color, dwt_decompose_color, dwt_reconstruct_color
-from scipy.fftpack import dct, idct
+from scipy.fft import dctn, idctn
 from a4_compression import decompress_huffman, parse_payload
 from a5_embedding_extraction import extract_from_dwt_bands_color, bits_to_bytes
 import numpy as np
@@ -33,12 +35,67 @@ import cv2
 
 # Helper functions
 def apply_dct(band):
-    """Apply 2D DCT to a band"""
-    return dct(dct(band, axis=0, norm='ortho'), axis=1, norm='ortho')
+    """Apply 2D DCT to a band (both axes in one scipy.fft call; color channels ride along)"""
+    return dctn(band, axes=(0, 1), norm='ortho')
 
 def apply_idct(band):
     """Apply inverse 2D DCT to a band"""
-    return idct(idct(band, axis=1, norm='ortho'), axis=0, norm='ortho')
+    return idctn(band, axes=(0, 1), norm='ortho')
+
+def extract_length_header(dct_bands, header_bits=32):
+    """Read the payload length header: the LSBs of the DCT coefficients above the threshold,
+    band by band in row-major order, vectorized per band"""
+    bits = []
+    remaining = header_bits
+    for band_name in ['LH1', 'HL1', 'LH2', 'HL2', 'HH1', 'HH2', 'LL2']:
+        if band_name not in dct_bands:
+            continue
+        coeffs = dct_bands[band_name].ravel()
+        band_bits = (coeffs[np.abs(coeffs) > 8].astype(np.int64) & 1)[:remaining]  # Threshold
+        bits.append(band_bits.astype(np.uint8))
+        remaining -= len(band_bits)
+        if not remaining:
+            break
+    
+    bits = np.concatenate(bits) if bits else np.empty(0, dtype=np.uint8)
+    if not len(bits):
+        raise ValueError("No length header found in the DCT bands")
+    # Pack MSB-first; a short header is right-aligned like int(bit_string, 2)
+    return int.from_bytes(np.packbits(bits).tobytes(), 'big') >> (-len(bits) % 8)
+
+@lru_cache(maxsize=4)
+def _decompose_stego_image(stego_image_path, mtime_ns, file_size):
+    """Read and 2-level DWT decompose a stego image; the (mtime, size) key makes a
+    rewritten file miss the cache. Bands are shared between calls, so read-only."""
+    bands = dwt_decompose_color(read_image_color(stego_image_path), levels=2)
+    for band in bands.values():
+        band.flags.writeable = False
+    return bands
+
+@lru_cache(maxsize=4)
+def _transform_stego_image(stego_image_path, mtime_ns, file_size):
+    """DWT bands plus the DCT of each extraction band, cached like _decompose_stego_image"""
+    bands = _decompose_stego_image(stego_image_path, mtime_ns, file_size)
+    band_names = [name for name in ['LH1', 'HL1', 'LH2', 'HL2', 'HH1', 'HH2', 'LL2'] if name in bands]
+    # The band DCTs are independent and scipy.fft runs them outside the GIL
+    with ThreadPoolExecutor(max_workers=max(1, min(len(band_names), os.cpu_count() or 1))) as executor:
+        dct_bands = dict(zip(band_names, executor.map(apply_dct, [bands[name] for name in band_names])))
+    for band in dct_bands.values():
+        band.flags.writeable = False
+    return bands, dct_bands
+
+def _file_version(path):
+    """Cache key for a file: its path, modification time and size"""
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size
+
+def decompose_stego_image(stego_image_path):
+    """DWT bands of a stego image, computed once per file version"""
+    return _decompose_stego_image(*_file_version(stego_image_path))
+
+def transform_stego_image(stego_image_path):
+    """(DWT bands, DCT'd extraction bands) of a stego image, computed once per file version"""
+    return _transform_stego_image(*_file_version(stego_image_path))
 
 # Configuration
 IDENTITY_FILE = "my_identity.json"
@@ -191,12 +248,28 @@ def peer_discovery_announcer(identity):
     sock.close()
 
 
+def recv_to_file(conn, size, f, chunk_size=65536):
+    """Stream size bytes from conn straight into the open file f through one reusable
+    chunk buffer, never holding the whole image in memory. Returns the bytes received."""
+    chunk = bytearray(chunk_size)
+    received = 0
+    with memoryview(chunk) as view:
+        while received < size:
+            count = conn.recv_into(view, min(chunk_size, size - received))
+            if not count:
+                break
+            f.write(view[:count])
+            received += count
+    return received
+
+
 def receive_file_listener(port=37021):
     """Listen for incoming stego images"""
     global running
     
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)  # 1 MB, inherited by accepted connections
     server_sock.bind(('', port))
     server_sock.listen(1)
     server_sock.settimeout(1)
@@ -223,21 +296,13 @@ def receive_file_listener(port=37021):
             # Image size
             image_size = struct.unpack('!I', conn.recv(4))[0]
             
-            # Receive image data
-            image_data = b''
-            while len(image_data) < image_size:
-                chunk = conn.recv(min(4096, image_size - len(image_data)))
-                if not chunk:
-                    break
-                image_data += chunk
-            
-            conn.close()
-            
-            # Save received image
+            # Receive image data, streamed straight to the saved file
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             filename = f"received_stego_{timestamp}.png"
             with open(filename, 'wb') as f:
-                f.write(image_data)
+                recv_to_file(conn, image_size, f)
+            
+            conn.close()
             
             print(f"[+] File received: {filename}")
             print(f"[+] Salt: {salt.hex()}")
@@ -277,11 +342,8 @@ def list_peers():
 def receive_encrypted_message_auto(stego_image_path, salt, iv, payload_bits_length):
     """Auto-decrypt received message (called by file listener)"""
     try:
-        # Step 1: READ STEGO IMAGE (COLOR)
-        stego_img = read_image_color(stego_image_path)
-        
-        # Step 2: DWT DECOMPOSITION (COLOR)
-        bands = dwt_decompose_color(stego_img, levels=2)
+        # Step 1+2: READ STEGO IMAGE + DWT DECOMPOSITION (COLOR, cached per file version)
+        bands = decompose_stego_image(stego_image_path)
         
         # Step 3: EXTRACTION (directly from DWT bands - no DCT needed)
         extracted_bits = extract_from_dwt_bands_color(bands, payload_bits_length, Q_factor=5.0)
@@ -319,46 +381,20 @@ def receive_encrypted_message(identity, stego_image_path, salt_hex, iv_hex):
         
         # Step 1: READ STEGO IMAGE (COLOR)
         print("[1/5] READING STEGO IMAGE...")
-        stego_img = read_image_color(stego_image_path)
+        # Read, DWT and DCT happen together here, once per file version - repeat
+        # extractions from the same image reuse the transformed bands
+        bands, dct_bands = transform_stego_image(stego_image_path)
         print(f"      [+] Loaded: {stego_image_path}")
         
         # Step 2: DWT + DCT TRANSFORM (COLOR)
         print("[2/5] DWT + DCT TRANSFORM...")
-        bands = dwt_decompose_color(stego_img, levels=2)
-        
-        # Apply DCT to extraction bands
-        dct_bands = {}
-        for band_name in ['LH1', 'HL1', 'LH2', 'HL2', 'HH1', 'HH2', 'LL2']:
-            if band_name in bands:
-                dct_bands[band_name] = apply_dct(bands[band_name])
         print(f"      [+] Transformed: 7 frequency bands")
         
         # Step 3: EXTRACTION
         print("[3/5] EXTRACTING HIDDEN DATA...")
         
         # Extract length header first (32 bits)
-        length_bits = ""
-        bit_index = 0
-        for band_name in ['LH1', 'HL1', 'LH2', 'HL2', 'HH1', 'HH2', 'LL2']:
-            if band_name not in dct_bands:
-                continue
-            band = dct_bands[band_name]
-            rows, cols = band.shape
-            
-            for i in range(rows):
-                for j in range(cols):
-                    if len(length_bits) < 32:
-                        coeff = band[i, j]
-                        if abs(coeff) > 8:  # Threshold
-                            length_bits += str(int(coeff) & 1)
-                    else:
-                        break
-                if len(length_bits) >= 32:
-                    break
-            if len(length_bits) >= 32:
-                break
-        
-        payload_length = int(length_bits, 2) * 8  # Convert to bits
+        payload_length = extract_length_header(dct_bands) * 8  # Convert to bits
         print(f"      [+] Payload length: {payload_length // 8} bytes")
         
         # Extract full payload
@@ -202,10 +202,26 @@ def encrypt_metadata_with_ecdh(metadata_dict, receiver_public_key_pem, sender_pr
     return encrypted_package
 
 
+def recv_to_file(conn, size, f, chunk_size=65536):
+    """Stream size bytes from conn straight into the open file f through one reusable
+    chunk buffer, never holding the whole image in memory. Returns the bytes received."""
+    chunk = bytearray(chunk_size)
+    received = 0
+    with memoryview(chunk) as view:
+        while received < size:
+            count = conn.recv_into(view, min(chunk_size, size - received))
+            if not count:
+                break
+            f.write(view[:count])
+            received += count
+    return received
+
+
 def receive_file_listener(identity, port=37021):
     """Listen for incoming stego images and save encrypted metadata"""
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)  # 1 MB, inherited by accepted connections
     server_sock.bind(('', port))
     server_sock.listen(1)
     server_sock.settimeout(1)
@@ -234,16 +250,6 @@ def receive_file_listener(identity, port=37021):
             # Image size
             image_size = struct.unpack('!I', conn.recv(4))[0]
             
-            # Receive image data
-            image_data = b''
-            while len(image_data) < image_size:
-                chunk = conn.recv(min(4096, image_size - len(image_data)))
-                if not chunk:
-                    break
-                image_data += chunk
-            
-            conn.close()
-            
             # Save received stego image with better naming
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             sender_ip = addr[0].replace(':', '_').replace('.', '_')
@@ -252,11 +258,14 @@ def receive_file_listener(identity, port=37021):
             base_filename = f"{sender_ip}_{timestamp}"
             stego_filename = f"{base_filename}.png"
             
+            # Receive image data, streamed straight to the saved file
             with open(stego_filename, 'wb') as f:
-                f.write(image_data)
+                image_size_received = recv_to_file(conn, image_size, f)
+            
+            conn.close()
             
             print(f"[+] Stego image saved: {stego_filename}")
-            print(f"[+] Image size: {len(image_data)} bytes")
+            print(f"[+] Image size: {image_size_received} bytes")
             
             # Create metadata JSON with encryption parameters
             metadata = {
@@ -26,6 +26,8 @@ CHAT_PORT = 9000
 BROADCAST_PORT = 65432
 MY_IDENTITY_FILE = 'my_identity.json'
 PEERS_FILE = 'peers.json'
+LENGTH_HEADER_BITS = 32  # big-endian payload byte count embedded ahead of the payload
+MAX_IMAGE_SIZE = 64 * 1024 * 1024  # the size header is unauthenticated; cap what it may allocate
 
 def get_local_ip():
     """Get local IP address"""
@@ -151,10 +153,24 @@ def get_peer_by_username(username, peers_list):
     """Find peer by username"""
     return next((p for p in peers_list if p["username"] == username), None)
 
+def recv_exactly(conn, size):
+    """Receive size bytes straight into one preallocated buffer (shorter if the peer closes early)"""
+    buffer = bytearray(size)
+    received = 0
+    with memoryview(buffer) as view:
+        while received < size:
+            count = conn.recv_into(view[received:], size - received)
+            if not count:
+                break
+            received += count
+    del buffer[received:]
+    return buffer
+
 def receive_stego_image():
     """Receive steganographic image via TCP"""
     server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)  # 1 MB, inherited by accepted connections
     server.bind(("0.0.0.0", CHAT_PORT))
     server.listen(1)
     
@@ -172,16 +188,13 @@ def receive_stego_image():
         return None
     
     size = struct.unpack('>I', size_data)[0]
+    if size > MAX_IMAGE_SIZE:
+        conn.close()
+        server.close()
+        return None
     
     # Receive image data
-    data = b''
-    remaining = size
-    while remaining > 0:
-        chunk = conn.recv(min(remaining, 8192))
-        if not chunk:
-            break
-        data += chunk
-        remaining -= len(chunk)
+    data = recv_exactly(conn, size)
     
     conn.close()
     server.close()
@@ -197,58 +210,53 @@ def extract_and_decrypt(stego_image, my_identity, peers_list):
     # DWT decompose
     bands = dwt_decompose(stego_image)
     
-    # Try multiple payload sizes
-    for size_bits in [2048, 4096, 8192, 16384]:
+    try:
+        # The sender prefixes the payload with its byte length, so one header read
+        # sizes the real extraction - no sweep over guessed payload sizes
+        payload_length = int(extract_from_dwt_bands(bands, LENGTH_HEADER_BITS), 2)
+        payload_bits = extract_from_dwt_bands(bands, LENGTH_HEADER_BITS + payload_length * 8)
+        payload_bits = payload_bits[LENGTH_HEADER_BITS:]
+        
+        # Convert bits to bytes
+        payload_bytes = bytearray()
+        for i in range(0, len(payload_bits), 8):
+            byte = int(payload_bits[i:i+8], 2)
+            payload_bytes.append(byte)
+        
+        payload = json.loads(payload_bytes.decode('utf-8', errors='ignore'))
+        if "sender" not in payload or "signed_data" not in payload:
+            raise ValueError("Not a LayerX message payload")
+        
+        sender_name = payload["sender"]
+        signed_data = base64.b64decode(payload["signed_data"])
+        
+        # Find sender peer
+        peer = get_peer_by_username(sender_name, peers_list)
+        if not peer:
+            print(f"⚠️  Unknown sender: {sender_name}")
+            print("   Use sender's IP and /add command to add them\n")
+            return
+        
+        # Verify signature
+        verify_key = VerifyKey(base64.b64decode(peer["signing_public"]))
         try:
-            payload_bits = extract_from_dwt_bands(bands, size_bits)
-            
-            # Convert bits to bytes
-            payload_bytes = bytearray()
-            for i in range(0, len(payload_bits), 8):
-                byte = int(payload_bits[i:i+8], 2)
-                payload_bytes.append(byte)
-            
-            # Try to decode JSON
-            try:
-                payload = json.loads(payload_bytes.decode('utf-8', errors='ignore'))
-                if "sender" not in payload or "signed_data" not in payload:
-                    continue
-            except:
-                continue
-            
-            sender_name = payload["sender"]
-            signed_data = base64.b64decode(payload["signed_data"])
-            
-            # Find sender peer
-            peer = get_peer_by_username(sender_name, peers_list)
-            if not peer:
-                print(f"⚠️  Unknown sender: {sender_name}")
-                print("   Use sender's IP and /add command to add them\n")
-                return
-            
-            # Verify signature
-            verify_key = VerifyKey(base64.b64decode(peer["signing_public"]))
-            try:
-                encrypted = verify_key.verify(signed_data)
-            except BadSignatureError:
-                print("❌ Signature verification failed!")
-                return
-            
-            # Decrypt message
-            my_priv = PrivateKey(base64.b64decode(my_identity["x25519_private"]))
-            peer_pub = PublicKey(base64.b64decode(peer["x25519_public"]))
-            box = Box(my_priv, peer_pub)
-            
-            message = box.decrypt(encrypted).decode('utf-8')
-            
-            print(f"✅ Message from {sender_name}:")
-            print(f"   {message}\n")
+            encrypted = verify_key.verify(signed_data)
+        except BadSignatureError:
+            print("❌ Signature verification failed!")
             return
-            
-        except Exception as e:
-            continue
-    
-    print("❌ Failed to extract/decrypt message\n")
+        
+        # Decrypt message
+        my_priv = PrivateKey(base64.b64decode(my_identity["x25519_private"]))
+        peer_pub = PublicKey(base64.b64decode(peer["x25519_public"]))
+        box = Box(my_priv, peer_pub)
+        
+        message = box.decrypt(encrypted).decode('utf-8')
+        
+        print(f"✅ Message from {sender_name}:")
+        print(f"   {message}\n")
+        
+    except Exception as e:
+        print("❌ Failed to extract/decrypt message\n")
 
 def main():
     """Main receiver loop"""
@@ -214,8 +214,8 @@ def embed_and_send(payload, peer_ip, cover_image="test_lena.png"):
     img = read_image(cover_image)
     bands = dwt_decompose(img)
     
-    # Convert payload to bits
-    payload_bits = ''.join(format(byte, '08b') for byte in payload)
+    # Convert payload to bits, behind a 32-bit length header so the receiver extracts it in one pass
+    payload_bits = ''.join(format(byte, '08b') for byte in struct.pack('>I', len(payload)) + payload)
     
     # Embed in DWT bands
     stego_bands = embed_in_dwt_bands(payload_bits, bands)
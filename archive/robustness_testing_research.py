@@ -24,20 +24,61 @@ if sys.platform == 'win32':
     sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 import numpy as np
+import pandas as pd
 import cv2
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 import json
+import zlib
 from skimage import util
+from Crypto.Protocol.KDF import PBKDF2
+from Crypto.Hash import SHA256
 import random
 
 # Import core modules
 sys.path.append('core_modules')
-from a1_encryption import encrypt_message, decrypt_message
+from a1_encryption import encrypt_message, decrypt_with_aes_key
 from a3_image_processing import read_image, dwt_decompose, dwt_reconstruct, psnr
 from a4_compression import compress_huffman, decompress_huffman
 from a5_embedding_extraction import embed_in_dwt_bands, extract_from_dwt_bands, bytes_to_bits, bits_to_bytes
 
+# JPEG quality levels for the compression sweep, with their imencode parameters built once
+_JPEG_QUALITY_LEVELS = [10, 30, 50, 70, 85, 95]
+_JPEG_ENCODE_PARAMS = {quality: [int(cv2.IMWRITE_JPEG_QUALITY), quality] for quality in _JPEG_QUALITY_LEVELS}
+
+def _results_frame(results):
+    """Columnar view of the fields the summaries group on, with the same defaults as r.get()"""
+    frame = pd.DataFrame.from_records(results).reindex(
+        columns=['test_type', 'image_type', 'jpeg_quality', 'extraction_success'])
+    frame['test_type'] = frame['test_type'].fillna('unknown')
+    frame['image_type'] = frame['image_type'].fillna('unknown')
+    frame['extraction_success'] = frame['extraction_success'].eq(True)
+    return frame
+
+def _success_by(frame, column, sort=False):
+    """Per-group test count, successful count and success rate (%), in first-seen order unless sorted"""
+    stats = frame.groupby(column, sort=sort)['extraction_success'].agg(total='size', successful='sum')
+    stats['rate'] = stats['successful'] / stats['total'] * 100
+    return stats
+
+def _derive_aes_key(password, salt):
+    """32-byte AES-256 key with the same PBKDF2 parameters as a1_encryption's decrypt_message"""
+    return PBKDF2(password.encode('utf-8'), salt, dkLen=32, count=100000, hmac_hash_module=SHA256)
+
+@lru_cache(maxsize=None)
+def _load_cover(cover_image_path):
+    """Cover image and its clean 2-level DWT bands, read and decomposed once per path.
+    embed_in_dwt_bands copies the bands before modifying them, so they can be shared."""
+    cover_image = read_image(cover_image_path)
+    bands = dwt_decompose(cover_image, levels=2)
+    # Shared by every embed (and every sweep thread) - make an accidental in-place write fail loudly
+    for array in [cover_image, *bands.values()]:
+        if isinstance(array, np.ndarray):
+            array.flags.writeable = False
+    return cover_image, bands
+
 def generate_key():
     """Generate a random password for encryption"""
     import secrets
@@ -70,27 +111,25 @@ class RobustnessTestingResearch:
         test_images = []
         
         # 1. Natural scene (typical photo-like)
-        natural = np.zeros((512, 512), dtype=np.uint8)
-        for i in range(512):
-            for j in range(512):
-                # Simulate natural image with multiple frequency components
-                natural[i, j] = int(128 + 
-                                  40 * np.sin(i/30) * np.cos(j/40) + 
-                                  20 * np.sin(i/8) * np.cos(j/12) +
-                                  10 * np.sin(i/3) * np.cos(j/5))
-        natural = np.clip(natural, 0, 255).astype(np.uint8)
+        # Simulate natural image with multiple frequency components, evaluated over the whole grid
+        i = np.arange(512, dtype=np.float64)[:, None]
+        j = np.arange(512, dtype=np.float64)[None, :]
+        natural = (128 +
+                   40 * np.sin(i/30) * np.cos(j/40) +
+                   20 * np.sin(i/8) * np.cos(j/12) +
+                   10 * np.sin(i/3) * np.cos(j/5))
+        natural = np.clip(natural.astype(np.int64), 0, 255).astype(np.uint8)
         natural_path = f"{self.output_dir}/test_images/natural_robust.png"
         cv2.imwrite(natural_path, natural)
         test_images.append({"path": natural_path, "type": "natural", "description": "Natural photo-like pattern"})
         
-        # 2. Textured image (high detail)
-        np.random.seed(42)
-        textured = np.random.randint(100, 200, (512, 512), dtype=np.uint8)
-        # Add structured patterns
-        for i in range(0, 512, 16):
-            for j in range(0, 512, 16):
-                block_value = int(128 + 50 * np.sin(i/20) * np.cos(j/30))
-                textured[i:i+8, j:j+8] = block_value
+        # 2. Textured image (high detail) - seeded Generator, so the image is reproducible
+        # without touching the global NumPy random state
+        textured = np.random.default_rng(42).integers(100, 200, (512, 512), dtype=np.uint8)
+        # Add structured patterns: an 8x8 block at the top-left of every 16x16 tile
+        corners = np.arange(0, 512, 16, dtype=np.float64)
+        block_values = (128 + 50 * np.sin(corners/20)[:, None] * np.cos(corners/30)[None, :]).astype(np.uint8)
+        textured.reshape(32, 16, 32, 16)[:, :8, :, :8] = block_values[:, None, :, None]
         textured_path = f"{self.output_dir}/test_images/textured_robust.png"
         cv2.imwrite(textured_path, textured)
         test_images.append({"path": textured_path, "type": "textured", "description": "High-detail textured pattern"})
@@ -101,7 +140,7 @@ class RobustnessTestingResearch:
     def embed_test_payload(self, cover_image_path, payload_text):
         """Embed test payload in cover image and return stego image"""
         
-        cover_image = read_image(cover_image_path)
+        _, bands = _load_cover(cover_image_path)
         
         # Process payload through LayerX pipeline
         key = generate_key()
@@ -110,16 +149,18 @@ class RobustnessTestingResearch:
         payload_bits = bytes_to_bits(compressed_payload)
         
         # Embed using DWT with Q=5.0
-        bands = dwt_decompose(cover_image, levels=2)
         modified_bands = embed_in_dwt_bands(payload_bits, bands, Q_factor=5.0)
         stego_image = dwt_reconstruct(modified_bands).astype(np.uint8)
         
-        # Return stego image and extraction info
+        # Return stego image and extraction info. The AES key is derived here once (the same
+        # PBKDF2 as decrypt_message) so each modification level only pays for the AES decrypt
         return stego_image, {
             "key": key,
+            "aes_key": _derive_aes_key(key, salt),
             "salt": salt,
             "iv": iv,
             "compression_table": compression_table,
+            "payload_crc32": zlib.crc32(compressed_payload),
             "payload_bits": len(payload_bits),
             "original_payload": payload_text
         }
@@ -133,10 +174,14 @@ class RobustnessTestingResearch:
             extracted_bits = extract_from_dwt_bands(bands, extraction_info["payload_bits"], Q_factor=5.0)
             extracted_payload = bits_to_bytes(extracted_bits)
             
+            # Cheap checksum first: a corrupted payload fails here instead of after the Huffman decode
+            if zlib.crc32(extracted_payload) != extraction_info["payload_crc32"]:
+                raise ValueError("Payload CRC32 mismatch - extracted payload is corrupted")
+            
             # Decompress and decrypt
             decompressed = decompress_huffman(extracted_payload, extraction_info["compression_table"])
-            final_message = decrypt_message(decompressed, extraction_info["key"], 
-                                          extraction_info["salt"], extraction_info["iv"])
+            final_message = decrypt_with_aes_key(decompressed, extraction_info["aes_key"],
+                                                 extraction_info["salt"], extraction_info["iv"])
             
             # Check if extraction successful
             extraction_success = final_message == extraction_info["original_payload"]
@@ -164,7 +209,7 @@ class RobustnessTestingResearch:
         print(f"-" * 55)
         
         jpeg_results = []
-        quality_levels = [10, 30, 50, 70, 85, 95]  # JPEG quality levels
+        quality_levels = _JPEG_QUALITY_LEVELS  # JPEG quality levels
         
         for payload_size in payload_sizes:
             test_payload = "LayerX robustness test payload. " * (payload_size // 32 + 1)
@@ -175,20 +220,25 @@ class RobustnessTestingResearch:
             try:
                 # Embed payload
                 stego_image, extraction_info = self.embed_test_payload(image_info["path"], test_payload)
-                original_psnr = psnr(read_image(image_info["path"]), stego_image)
+                original_psnr = psnr(_load_cover(image_info["path"])[0], stego_image)
                 
-                for quality in quality_levels:
-                    # Apply JPEG compression
-                    temp_path = f"{self.output_dir}/temp_jpeg_q{quality}.jpg"
-                    cv2.imwrite(temp_path, stego_image, [cv2.IMWRITE_JPEG_QUALITY, quality])
-                    compressed_image = cv2.imread(temp_path, cv2.IMREAD_GRAYSCALE)
+                def compress_and_extract(quality):
+                    # Apply JPEG compression - encoded to and decoded from memory, no temp file
+                    _, encoded_image = cv2.imencode('.jpg', stego_image, _JPEG_ENCODE_PARAMS[quality])
+                    compressed_image = cv2.imdecode(encoded_image, cv2.IMREAD_GRAYSCALE)
                     
-                    # Test extraction
+                    # Test extraction, then calculate quality metrics
                     extraction_result = self.test_extraction_after_modification(compressed_image, extraction_info)
-                    
-                    # Calculate quality metrics
-                    compressed_psnr = psnr(stego_image, compressed_image)
-                    
+                    return extraction_result, psnr(stego_image, compressed_image)
+                
+                # Quality levels are independent trials on the same stego image; the codec, DWT and
+                # AES work is mostly GIL-free C code, so threads overlap it. map() keeps result order.
+                # The threads share the stego image by reference, read-only, instead of copying it.
+                stego_image.flags.writeable = False
+                with ThreadPoolExecutor(max_workers=min(len(quality_levels), os.cpu_count() or 1)) as executor:
+                    trials = list(executor.map(compress_and_extract, quality_levels))
+                
+                for quality, (extraction_result, compressed_psnr) in zip(quality_levels, trials):
                     result = {
                         "test_type": "jpeg_compression",
                         "image_type": image_info["type"],
@@ -203,10 +253,6 @@ class RobustnessTestingResearch:
                     
                     status = "✅" if extraction_result["extraction_success"] else "❌"
                     print(f"   Q={quality:2d}: {status} PSNR={compressed_psnr:5.2f}dB Match={extraction_result['match_percentage']:5.1f}%")
-                    
-                    # Clean up temp file
-                    if os.path.exists(temp_path):
-                        os.remove(temp_path)
                         
             except Exception as e:
                 print(f"   ❌ Error: {str(e)}")
@@ -468,6 +514,12 @@ class RobustnessTestingResearch:
         self.results = all_results
         return all_results
     
+    def _jpeg_success_by_quality(self, frame):
+        """Success statistics of the JPEG compression tests per quality level, in ascending quality"""
+        jpeg = frame[frame['test_type'] == 'jpeg_compression']
+        jpeg = jpeg.fillna({'jpeg_quality': 0}).astype({'jpeg_quality': int})
+        return _success_by(jpeg, 'jpeg_quality', sort=True)
+    
     def generate_robustness_analysis_plots(self):
         """Generate visualization plots for robustness analysis"""
         
@@ -477,27 +529,20 @@ class RobustnessTestingResearch:
             print("No results to plot")
             return
         
-        # Filter successful extractions
-        successful_results = [r for r in self.results if r.get('extraction_success', False)]
+        # One columnar pass over the results; every panel below is a group-by on it
+        frame = _results_frame(self.results)
         
-        if not successful_results:
+        # Filter successful extractions
+        if not frame['extraction_success'].any():
             print("No successful extractions to analyze")
             return
         
         fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
         
         # 1. Success Rate by Test Type
-        test_types = {}
-        for result in self.results:
-            test_type = result.get('test_type', 'unknown')
-            if test_type not in test_types:
-                test_types[test_type] = {"total": 0, "successful": 0}
-            test_types[test_type]["total"] += 1
-            if result.get('extraction_success', False):
-                test_types[test_type]["successful"] += 1
-        
-        type_names = list(test_types.keys())
-        success_rates = [test_types[t]["successful"] / test_types[t]["total"] * 100 for t in type_names]
+        test_types = _success_by(frame, 'test_type')
+        type_names = test_types.index.tolist()
+        success_rates = test_types['rate'].tolist()
         
         bars = ax1.bar(range(len(type_names)), success_rates, alpha=0.7, 
                       color=['green' if sr >= 80 else 'orange' if sr >= 50 else 'red' for sr in success_rates])
@@ -516,20 +561,13 @@ class RobustnessTestingResearch:
                     f'{rate:.1f}%', ha='center', va='bottom')
         
         # 2. JPEG Compression Resistance
-        jpeg_results = [r for r in self.results if r.get('test_type') == 'jpeg_compression']
-        if jpeg_results:
-            quality_levels = sorted(list(set(r.get('jpeg_quality', 0) for r in jpeg_results)))
-            jpeg_success_by_quality = {}
+        jpeg_by_quality = self._jpeg_success_by_quality(frame)
+        if not jpeg_by_quality.empty:
+            quality_levels = jpeg_by_quality.index.tolist()
             
-            for quality in quality_levels:
-                quality_results = [r for r in jpeg_results if r.get('jpeg_quality') == quality]
-                success_count = len([r for r in quality_results if r.get('extraction_success', False)])
-                total_count = len(quality_results)
-                jpeg_success_by_quality[quality] = (success_count / total_count * 100) if total_count > 0 else 0
-            
-            ax2.plot(quality_levels, [jpeg_success_by_quality[q] for q in quality_levels], 
+            ax2.plot(quality_levels, jpeg_by_quality['rate'].tolist(), 
                     marker='o', linewidth=2, markersize=8, color='blue')
-            ax2.fill_between(quality_levels, [jpeg_success_by_quality[q] for q in quality_levels], alpha=0.3)
+            ax2.fill_between(quality_levels, jpeg_by_quality['rate'].tolist(), alpha=0.3)
             ax2.set_xlabel('JPEG Quality Level')
             ax2.set_ylabel('Success Rate (%)')
             ax2.set_title('JPEG Compression Resistance')
@@ -538,17 +576,15 @@ class RobustnessTestingResearch:
             ax2.axhline(y=50, color='orange', linestyle=':', alpha=0.6)
         
         # 3. Noise Resistance
-        noise_results = [r for r in self.results if 'noise' in r.get('test_type', '')]
-        if noise_results:
+        noise_mask = frame['test_type'].str.contains('noise', regex=False)
+        if noise_mask.any():
             # Group by noise type
-            gaussian_results = [r for r in noise_results if 'gaussian' in r.get('test_type', '')]
-            sp_results = [r for r in noise_results if 'salt_pepper' in r.get('test_type', '')]
-            
             noise_data = {}
-            for results, name in [(gaussian_results, 'Gaussian'), (sp_results, 'Salt&Pepper')]:
-                if results:
-                    success_rate = len([r for r in results if r.get('extraction_success', False)]) / len(results) * 100
-                    noise_data[name] = success_rate
+            for marker, name in [('gaussian', 'Gaussian'), ('salt_pepper', 'Salt&Pepper')]:
+                successes = frame.loc[noise_mask & frame['test_type'].str.contains(marker, regex=False),
+                                      'extraction_success']
+                if len(successes):
+                    noise_data[name] = int(successes.sum()) / len(successes) * 100
             
             if noise_data:
                 bars = ax3.bar(noise_data.keys(), noise_data.values(), alpha=0.7, color=['skyblue', 'lightcoral'])
@@ -563,14 +599,7 @@ class RobustnessTestingResearch:
                             f'{rate:.1f}%', ha='center', va='bottom')
         
         # 4. Overall Robustness Summary
-        image_types = list(set(r.get('image_type', 'unknown') for r in self.results))
-        image_success = {}
-        
-        for img_type in image_types:
-            type_results = [r for r in self.results if r.get('image_type') == img_type]
-            success_count = len([r for r in type_results if r.get('extraction_success', False)])
-            total_count = len(type_results)
-            image_success[img_type] = (success_count / total_count * 100) if total_count > 0 else 0
+        image_success = _success_by(frame, 'image_type')['rate'].to_dict()
         
         bars = ax4.bar(image_success.keys(), image_success.values(), alpha=0.7, color='lightgreen')
         ax4.set_ylabel('Success Rate (%)')
@@ -611,45 +640,33 @@ class RobustnessTestingResearch:
             f.write(f"**Test Type:** Real-world Image Modification Resistance\n\n")
             
             if self.results:
-                successful_results = [r for r in self.results if r.get('extraction_success', False)]
+                frame = _results_frame(self.results)
+                successful_count = int(frame['extraction_success'].sum())
                 
                 f.write("## Executive Summary\n\n")
                 f.write(f"- **Total Tests:** {len(self.results)}\n")
-                f.write(f"- **Successful Extractions:** {len(successful_results)} ({len(successful_results)/len(self.results)*100:.1f}%)\n")
+                f.write(f"- **Successful Extractions:** {successful_count} ({successful_count/len(self.results)*100:.1f}%)\n")
                 
                 # Success rate by test type
-                test_types = {}
-                for result in self.results:
-                    test_type = result.get('test_type', 'unknown')
-                    if test_type not in test_types:
-                        test_types[test_type] = {"total": 0, "successful": 0}
-                    test_types[test_type]["total"] += 1
-                    if result.get('extraction_success', False):
-                        test_types[test_type]["successful"] += 1
+                test_types = _success_by(frame, 'test_type')
                 
                 f.write("\n## Robustness Analysis by Modification Type\n\n")
                 f.write("| Modification Type | Tests | Success Rate | Status |\n")
                 f.write("|------------------|-------|--------------|--------|\n")
                 
-                for test_type, stats in test_types.items():
-                    success_rate = (stats["successful"] / stats["total"] * 100) if stats["total"] > 0 else 0
+                for test_type, total, success_rate in zip(test_types.index, test_types['total'], test_types['rate']):
                     status = "🟢 Robust" if success_rate >= 80 else "🟡 Moderate" if success_rate >= 50 else "🔴 Weak"
-                    f.write(f"| {test_type.replace('_', ' ').title()} | {stats['total']} | {success_rate:.1f}% | {status} |\n")
+                    f.write(f"| {test_type.replace('_', ' ').title()} | {total} | {success_rate:.1f}% | {status} |\n")
                 
                 # JPEG compression detailed analysis
-                jpeg_results = [r for r in self.results if r.get('test_type') == 'jpeg_compression']
-                if jpeg_results:
+                jpeg_by_quality = self._jpeg_success_by_quality(frame)
+                if not jpeg_by_quality.empty:
                     f.write("\n### JPEG Compression Resistance\n\n")
                     f.write("| Quality Level | Tests | Success Rate | Notes |\n")
                     f.write("|---------------|-------|--------------|-------|\n")
                     
-                    quality_levels = sorted(list(set(r.get('jpeg_quality', 0) for r in jpeg_results)))
-                    for quality in quality_levels:
-                        quality_results = [r for r in jpeg_results if r.get('jpeg_quality') == quality]
-                        success_count = len([r for r in quality_results if r.get('extraction_success', False)])
-                        total_count = len(quality_results)
-                        success_rate = (success_count / total_count * 100) if total_count > 0 else 0
-                        
+                    for quality, total_count, success_rate in zip(jpeg_by_quality.index, jpeg_by_quality['total'],
+                                                                  jpeg_by_quality['rate']):
                         if quality >= 80:
                             notes = "High quality - good resistance expected"
                         elif quality >= 50:
@@ -662,7 +679,7 @@ class RobustnessTestingResearch:
                 f.write("\n## Key Robustness Findings\n\n")
                 
                 # Overall robustness assessment
-                overall_success_rate = len(successful_results) / len(self.results) * 100
+                overall_success_rate = successful_count / len(self.results) * 100
                 if overall_success_rate >= 80:
                     robustness_level = "🟢 EXCELLENT - High robustness against modifications"
                 elif overall_success_rate >= 60:
@@ -672,15 +689,15 @@ class RobustnessTestingResearch:
                 
                 f.write(f"1. **Overall Robustness:** {overall_success_rate:.1f}% - {robustness_level}\n")
                 
-                # Most robust against
-                best_test = max(test_types.items(), key=lambda x: x[1]["successful"]/x[1]["total"] if x[1]["total"] > 0 else 0)
-                best_success_rate = (best_test[1]["successful"] / best_test[1]["total"] * 100) if best_test[1]["total"] > 0 else 0
-                f.write(f"2. **Most Robust Against:** {best_test[0].replace('_', ' ').title()} ({best_success_rate:.1f}% success)\n")
+                # Most robust against (idxmax/idxmin keep the first of any tie, like max/min)
+                best_test = test_types['rate'].idxmax()
+                best_success_rate = test_types.at[best_test, 'rate']
+                f.write(f"2. **Most Robust Against:** {best_test.replace('_', ' ').title()} ({best_success_rate:.1f}% success)\n")
                 
                 # Most vulnerable to
-                worst_test = min(test_types.items(), key=lambda x: x[1]["successful"]/x[1]["total"] if x[1]["total"] > 0 else 0)
-                worst_success_rate = (worst_test[1]["successful"] / worst_test[1]["total"] * 100) if worst_test[1]["total"] > 0 else 0
-                f.write(f"3. **Most Vulnerable To:** {worst_test[0].replace('_', ' ').title()} ({worst_success_rate:.1f}% success)\n")
+                worst_test = test_types['rate'].idxmin()
+                worst_success_rate = test_types.at[worst_test, 'rate']
+                f.write(f"3. **Most Vulnerable To:** {worst_test.replace('_', ' ').title()} ({worst_success_rate:.1f}% success)\n")
                 
                 f.write("\n## Deployment Recommendations\n\n")
                 f.write("### Production Guidelines\n")
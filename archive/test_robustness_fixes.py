@@ -64,7 +64,7 @@ except Exception as e:
 print("\n3️⃣ Testing embedding with new band order...")
 try:
     # Create a test image
-    test_img = np.random.randint(50, 200, (256, 256), dtype=np.uint8)
+    test_img = np.random.default_rng(42).integers(50, 200, (256, 256), dtype=np.uint8)
     
     # Save test image
     cv2.imwrite("test_robustness_cover.png", test_img)
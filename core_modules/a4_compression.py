@@ -2,7 +2,7 @@
 Module 4: Compression  
 Author: Member A
 Description: Huffman compression for encrypted data (post-encryption, pre-embedding)
-Dependencies: heapq, collections, reedsolo
+Dependencies: heapq, collections, numpy, reedsolo
 
 Functions:
 - compress_huffman(data: bytes) → (compressed: bytes, tree: bytes)
@@ -13,12 +13,18 @@ Functions:
 
 import heapq
 import pickle
+from functools import lru_cache
 from collections import Counter, defaultdict
 from typing import Tuple, Dict, Optional
 import struct
+import numpy as np
 from reedsolo import RSCodec
 
 
+# Bits resolved per lookup-table probe when decoding; longer codes take a second stage
+DECODE_TABLE_BITS = 11
+
+
 class HuffmanNode:
     """Node for Huffman tree"""
     def __init__(self, char: Optional[int] = None, freq: int = 0, left=None, right=None):
@@ -93,9 +99,46 @@ class HuffmanCompressor:
         return pickle.dumps(root)
     
     @staticmethod
+    @lru_cache(maxsize=32)
     def _deserialize_tree(tree_bytes: bytes) -> HuffmanNode:
-        """Deserialize Huffman tree from bytes"""
+        """Deserialize Huffman tree from bytes (cached per tree; decoding only reads it)"""
         return pickle.loads(tree_bytes)
+    
+    @staticmethod
+    @lru_cache(maxsize=32)
+    def _build_decode_table(tree_bytes: bytes) -> Tuple[int, np.ndarray, np.ndarray, Dict[int, HuffmanNode]]:
+        """
+        Build the L-bit lookup table for a multi-symbol tree (cached per tree).
+        
+        Every L-bit window whose top k bits are a code of length k <= L maps to
+        (symbol, k). Windows that start a longer code map to length 0 and are
+        resolved from the subtree node reached after their L bits.
+        """
+        root = HuffmanCompressor._deserialize_tree(tree_bytes)
+        codes = HuffmanCompressor._build_codes(root)
+        table_bits = min(DECODE_TABLE_BITS, max(len(code) for code in codes.values()))
+        
+        symbols = np.zeros(1 << table_bits, dtype=np.uint8)
+        lengths = np.zeros(1 << table_bits, dtype=np.uint8)
+        for byte_val, code in codes.items():
+            if len(code) <= table_bits:
+                start = int(code, 2) << (table_bits - len(code))
+                stop = start + (1 << (table_bits - len(code)))
+                symbols[start:stop] = byte_val
+                lengths[start:stop] = len(code)
+        
+        # Second stage: the node each long-code prefix leads to
+        long_prefixes = {}
+        for code in codes.values():
+            if len(code) > table_bits:
+                prefix = int(code[:table_bits], 2)
+                if prefix not in long_prefixes:
+                    node = root
+                    for bit in code[:table_bits]:
+                        node = node.right if bit == '1' else node.left
+                    long_prefixes[prefix] = node
+        
+        return table_bits, symbols, lengths, long_prefixes
 
 
 def compress_huffman(data: bytes) -> Tuple[bytes, bytes]:
@@ -121,18 +164,22 @@ def compress_huffman(data: bytes) -> Tuple[bytes, bytes]:
     # Build prefix codes
     codes = HuffmanCompressor._build_codes(root)
     
-    # Encode data
-    encoded_bits = ''.join(codes[byte] for byte in data)
+    # Encode data: lay the codes out as a (256, max_len) bit table, gather one
+    # row per input byte and keep only each row's first code_len bits
+    max_len = max(len(code) for code in codes.values())
+    code_bits = np.zeros((256, max_len), dtype=np.uint8)
+    code_len = np.zeros(256, dtype=np.int64)
+    for byte_val, code in codes.items():
+        code_bits[byte_val, :len(code)] = np.frombuffer(code.encode('ascii'), dtype=np.uint8) - ord('0')
+        code_len[byte_val] = len(code)
+    valid = np.arange(max_len) < code_len[:, None]
     
-    # Convert bit string to bytes (pad to byte boundary)
-    padding = 8 - (len(encoded_bits) % 8)
-    if padding != 8:
-        encoded_bits += '0' * padding
+    symbols = np.frombuffer(data, dtype=np.uint8)
+    encoded_bits = code_bits[symbols][valid[symbols]]
     
-    compressed_bytes = bytearray()
-    for i in range(0, len(encoded_bits), 8):
-        byte_str = encoded_bits[i:i+8]
-        compressed_bytes.append(int(byte_str, 2))
+    # Pack bits to bytes (np.packbits zero-pads to the byte boundary)
+    padding = 8 - (len(encoded_bits) % 8)
+    compressed_bytes = np.packbits(encoded_bits).tobytes()
     
     # Serialize tree
     tree_bytes = HuffmanCompressor._serialize_tree(root)
@@ -167,35 +214,53 @@ def decompress_huffman(compressed_data: bytes, tree_bytes: bytes) -> bytes:
     padding = compressed_data[0]
     compressed_bytes = compressed_data[1:]
     
-    # Convert bytes back to bit string
-    bit_string = ''.join(format(byte, '08b') for byte in compressed_bytes)
+    # Convert bytes back to a bit array
+    bits = np.unpackbits(np.frombuffer(compressed_bytes, dtype=np.uint8))
     
     # Remove padding
     if padding and padding < 8:
-        bit_string = bit_string[:-padding]
+        bits = bits[:len(bits) - padding]
+    bit_count = len(bits)
     
     # Handle single character tree
     if root.char is not None:
         # For single character, each bit represents one instance
-        char_count = len(bit_string)
-        return bytes([root.char] * char_count)
+        return bytes([root.char] * bit_count)
+    
+    # Decode with the lookup table: the L-bit window starting at every bit position
+    # (zero-padded past the end) resolves the symbol starting there in one probe
+    table_bits, symbols, lengths, long_prefixes = HuffmanCompressor._build_decode_table(tree_bytes)
+    padded = np.concatenate([bits, np.zeros(table_bits, dtype=np.uint8)]).astype(np.int32)
+    windows = np.zeros(bit_count, dtype=np.int32)
+    for offset in range(table_bits):
+        windows = (windows << 1) | padded[offset:offset + bit_count]
+    symbol_at = symbols[windows].tolist()
+    length_at = lengths[windows].tolist()
     
-    # Decode using tree traversal
     decoded = bytearray()
-    current = root
-    
-    for bit in bit_string:
-        if bit == '0' and current.left:
-            current = current.left
-        elif bit == '1' and current.right:
-            current = current.right
-        else:
-            raise ValueError("Invalid bit sequence in compressed data")
+    pos = 0
+    while pos < bit_count:
+        code_len = length_at[pos]
+        if code_len:
+            if pos + code_len > bit_count:
+                break  # Trailing partial code
+            decoded.append(symbol_at[pos])
+            pos += code_len
+            continue
         
-        # Check if we reached a leaf
-        if current.char is not None:
-            decoded.append(current.char)
-            current = root
+        # Code longer than the table: finish it bit by bit from its prefix's subtree
+        current = long_prefixes.get(int(windows[pos]))
+        if current is None:
+            raise ValueError("Invalid bit sequence in compressed data")
+        pos += table_bits
+        while current.char is None and pos < bit_count:
+            current = current.right if bits[pos] else current.left
+            if current is None:
+                raise ValueError("Invalid bit sequence in compressed data")
+            pos += 1
+        if current.char is None:
+            break  # Trailing partial code
+        decoded.append(current.char)
     
     return bytes(decoded)
 
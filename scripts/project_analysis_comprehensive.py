@@ -10,18 +10,47 @@ Complete analysis of the LayerX steganography project to identify:
 5. Real-world scenario validation
 """
 
+import io
 import os
+import re
+import sys
 import json
+import heapq
 import importlib.util
+from contextlib import contextmanager, redirect_stdout
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Set, Tuple
 from datetime import datetime
 
+# File-name filters for the structure scan, one compiled pattern per directory listing.
+# Case-insensitive like the glob they replace on the Windows checkout (h:/LAYERX).
+_MODULE_FILE_RE = re.compile(r'(?!__).*\.py', re.IGNORECASE)
+_TEST_FILE_RE = re.compile(r'test_.*\.py', re.IGNORECASE)
+# Root entries: the matching group names the structure_analysis category
+_ROOT_FILE_RE = re.compile(r'(?P<research_scripts>.*research.*\.py)|(?P<documentation>.*\.md)', re.IGNORECASE)
+
+def _list_files(directory: str, pattern: re.Pattern) -> List[str]:
+    """Names of the files in directory that fully match pattern, from a single scandir pass"""
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries if entry.is_file() and pattern.fullmatch(entry.name)]
+    except FileNotFoundError:
+        return []
+
+def _entry_names(directory: str) -> Set[str]:
+    """Lower-cased names of everything in directory (empty if it is missing); look up name.lower() instead of a stat per name"""
+    try:
+        return {name.lower() for name in os.listdir(directory)}
+    except FileNotFoundError:
+        return set()
+
 class LayerXProjectAnalyzer:
     """Comprehensive project analysis and research gap identification"""
     
-    def __init__(self):
+    def __init__(self, stream: bool = False):
         self.project_root = Path("h:/LAYERX")
+        self.stream = stream  # print line by line instead of once per section
         self.analysis_results = {}
         self.research_gaps = []
         self.completed_research = []
@@ -42,40 +71,31 @@ class LayerXProjectAnalyzer:
             "documentation": []
         }
         
-        # Core modules analysis
-        core_modules_dir = Path("core_modules")
-        if core_modules_dir.exists():
-            for file in core_modules_dir.glob("*.py"):
-                if not file.name.startswith("__"):
-                    structure_analysis["core_modules"].append(file.name)
-        
-        # Research scripts
-        for file in Path(".").glob("*research*.py"):
-            structure_analysis["research_scripts"].append(file.name)
-        
-        # Test scripts  
-        tests_dir = Path("tests")
-        if tests_dir.exists():
-            for file in tests_dir.glob("test_*.py"):
-                structure_analysis["test_scripts"].append(file.name)
-        
-        # Applications
-        apps_dir = Path("applications")
-        if apps_dir.exists():
-            for file in apps_dir.glob("*.py"):
-                if not file.name.startswith("__"):
-                    structure_analysis["applications"].append(file.name)
-        
-        # Documentation
-        for file in Path(".").glob("*.md"):
-            structure_analysis["documentation"].append(file.name)
+        # The directory listings are independent blocking I/O, so the core modules, test scripts
+        # and applications are listed on worker threads while the project root is scanned here
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            subdirectory_scans = {
+                "core_modules": executor.submit(_list_files, "core_modules", _MODULE_FILE_RE),
+                "test_scripts": executor.submit(_list_files, "tests", _TEST_FILE_RE),
+                "applications": executor.submit(_list_files, "applications", _MODULE_FILE_RE)
+            }
+            
+            # Research scripts and documentation - one pass over the project root for both
+            with os.scandir(".") as entries:
+                for entry in entries:
+                    match = _ROOT_FILE_RE.fullmatch(entry.name)
+                    if match and entry.is_file():
+                        structure_analysis[match.lastgroup].append(entry.name)
+            
+            for category, scan in subdirectory_scans.items():
+                structure_analysis[category] = scan.result()
         
         self.analysis_results["structure"] = structure_analysis
         
         # Print analysis
         for category, files in structure_analysis.items():
             print(f"{category.upper()}: {len(files)} files")
-            for file in sorted(files)[:5]:  # Show first 5
+            for file in heapq.nsmallest(5, files):  # Show first 5 (alphabetically) without sorting them all
                 print(f"  📄 {file}")
             if len(files) > 5:
                 print(f"  ... and {len(files)-5} more")
@@ -247,12 +267,12 @@ class LayerXProjectAnalyzer:
             "research_tests": ["local_comprehensive_research.py", "scientific_steganography_research.py"]
         }
         
+        # A test counts if it is in tests/ or the current directory - two listings cover every lookup
+        available_tests = _entry_names("tests") | _entry_names(".")
+        
         coverage_analysis = {}
         for category, tests in test_categories.items():
-            existing_tests = []
-            for test in tests:
-                if Path(f"tests/{test}").exists() or Path(test).exists():
-                    existing_tests.append(test)
+            existing_tests = [test for test in tests if test.lower() in available_tests]
             
             coverage_analysis[category] = {
                 "expected": len(tests),
@@ -413,15 +433,36 @@ class LayerXProjectAnalyzer:
         print(f"✅ Analysis report saved: {report_file}")
         return report_file
     
+    @contextmanager
+    def _section_output(self):
+        """Collect a section's prints and write them to stdout in one go"""
+        if self.stream:
+            yield
+            return
+        buffer = io.StringIO()
+        try:
+            with redirect_stdout(buffer):
+                yield
+        finally:
+            sys.stdout.write(buffer.getvalue())
+            sys.stdout.flush()
+    
     def run_complete_analysis(self):
         """Run the complete project analysis"""
-        self.analyze_project_structure()
-        self.analyze_completed_research()
-        self.identify_research_gaps()
-        self.analyze_test_coverage()
-        recommendations = self.generate_research_recommendations()
-        roadmap = self.create_research_roadmap()
-        report_file = self.generate_full_report()
+        with self._section_output():
+            self.analyze_project_structure()
+        with self._section_output():
+            self.analyze_completed_research()
+        with self._section_output():
+            self.identify_research_gaps()
+        with self._section_output():
+            self.analyze_test_coverage()
+        with self._section_output():
+            recommendations = self.generate_research_recommendations()
+        with self._section_output():
+            roadmap = self.create_research_roadmap()
+        with self._section_output():
+            report_file = self.generate_full_report()
         
         print(f"\n🎯 ANALYSIS COMPLETE!")
         print(f"📂 Report saved: {report_file}")
@@ -436,5 +477,5 @@ class LayerXProjectAnalyzer:
         }
 
 if __name__ == "__main__":
-    analyzer = LayerXProjectAnalyzer()
+    analyzer = LayerXProjectAnalyzer(stream="--stream" in sys.argv[1:])
     results = analyzer.run_complete_analysis()
\ No newline at end of file
@@ -11,12 +11,25 @@ Questions to Address:
 """
 
 import os
+import re
 import sys
+import mmap
 import numpy as np
 import cv2
 import json
+from enum import IntFlag
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 print("🚨 LayerX CRITICAL TECHNICAL ANALYSIS")
 print("=" * 45)
 print("📊 ADDRESSING THE CATASTROPHIC ROBUSTNESS FAILURE")
@@ -26,6 +39,64 @@ print()
 print("🔍 QUESTION 1: WHICH FREQUENCY BANDS ARE WE USING?")
 print("=" * 55)
 
+class SourceMarker(IntFlag):
+    """Markers looked for in the embedding module source, collected as one bitmask"""
+    HH = 1
+    HL = 2
+    LH = 4
+    LL = 8
+    QF = 16
+    ADAPTIVE = 32
+    QUALITY = 64
+    OPTIMIZE = 128
+
+_ALL_SOURCE_MARKERS = SourceMarker(sum(SourceMarker))
+_BAND_MARKERS = {SourceMarker.HH: 'HH (High-High)', SourceMarker.HL: 'HL (High-Low)',
+                 SourceMarker.LH: 'LH (Low-High)', SourceMarker.LL: 'LL (Low-Low)'}
+# Matched text (keywords lowercased) -> its flag
+_SOURCE_MARKER_FLAGS = {b'HH': SourceMarker.HH, b'HL': SourceMarker.HL, b'LH': SourceMarker.LH,
+                        b'LL': SourceMarker.LL, b'Q=': SourceMarker.QF, b'adaptive': SourceMarker.ADAPTIVE,
+                        b'quality': SourceMarker.QUALITY, b'optimize': SourceMarker.OPTIMIZE}
+# Every marker in one automaton, so the source is scanned in a single pass; the lookahead reports
+# overlapping hits (e.g. both HH and HL in "HHL") and the keywords match case-insensitively
+_SOURCE_MARKERS_RE = re.compile(rb'(?=(?P<band>HH|HL|LH|LL)|(?P<qf>Q=)|(?i:(?P<word>adaptive|quality|optimize)))')
+
+# With hyperscan installed the same markers are compiled once into a DFA database (keywords caseless,
+# each reported once) - the regex above is the fallback
+if hyperscan is not None:
+    _SOURCE_MARKER_IDS = list(_SOURCE_MARKER_FLAGS.values())
+    _SOURCE_MARKER_DB = hyperscan.Database()
+    _SOURCE_MARKER_DB.compile(
+        expressions=list(_SOURCE_MARKER_FLAGS),
+        ids=list(range(len(_SOURCE_MARKER_IDS))),
+        elements=len(_SOURCE_MARKER_IDS),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH | (hyperscan.HS_FLAG_CASELESS if needle.islower() else 0)
+               for needle in _SOURCE_MARKER_FLAGS],
+    )
+
+def _scan_source_markers(source) -> SourceMarker:
+    """Bitmask of the markers present in source (bytes or mmap), stopping once all are found"""
+    found = SourceMarker(0)
+    if hyperscan is not None:
+        def on_match(marker_id, start, end, flags, context):
+            nonlocal found
+            found |= _SOURCE_MARKER_IDS[marker_id]
+            return found == _ALL_SOURCE_MARKERS  # True halts the scan
+        
+        try:
+            # Slicing hands the scanner a plain bytes object whether source is bytes or an mmap
+            _SOURCE_MARKER_DB.scan(source[:], match_event_handler=on_match)
+        except hyperscan.ScanTerminated:
+            pass
+        return found
+    
+    for match in _SOURCE_MARKERS_RE.finditer(source):
+        found |= _SOURCE_MARKER_FLAGS[match['band'] or match['qf'] or match['word'].lower()]
+        # Markers usually all appear near the top; stop before paging in the rest of the file
+        if found == _ALL_SOURCE_MARKERS:
+            break
+    return found
+
 # Check the actual embedding implementation
 def analyze_frequency_band_usage():
     """Analyze which DWT/DCT bands LayerX actually uses"""
@@ -34,29 +105,31 @@ def analyze_frequency_band_usage():
     
     # Read the actual embedding code to understand what bands are used
     try:
-        with open('a5_embedding_extraction.py', 'r') as f:
-            embedding_code = f.read()
+        # Scan the mapped source bytes in place - no decode, no lowercased copies
+        with open('a5_embedding_extraction.py', 'rb') as f:
+            if os.fstat(f.fileno()).st_size:
+                embedding_code = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                embedding_code = b''
+        
+        try:
+            found = _scan_source_markers(embedding_code)
+        finally:
+            if isinstance(embedding_code, mmap.mmap):
+                embedding_code.close()
         
         # Look for DWT band usage
-        dwt_bands_used = []
-        if 'HH' in embedding_code:
-            dwt_bands_used.append('HH (High-High)')
-        if 'HL' in embedding_code:
-            dwt_bands_used.append('HL (High-Low)')
-        if 'LH' in embedding_code:
-            dwt_bands_used.append('LH (Low-High)')
-        if 'LL' in embedding_code:
-            dwt_bands_used.append('LL (Low-Low)')
-            
+        dwt_bands_used = [label for marker, label in _BAND_MARKERS.items() if found & marker]
+        
         print(f"   📊 DWT Bands Found in Code: {dwt_bands_used}")
         
         # Check for adaptive/optimization mentions
         adaptive_features = []
-        if 'adaptive' in embedding_code.lower():
+        if found & SourceMarker.ADAPTIVE:
             adaptive_features.append('Adaptive embedding detected')
-        if 'Q=' in embedding_code or 'quality' in embedding_code.lower():
+        if found & (SourceMarker.QF | SourceMarker.QUALITY):
             adaptive_features.append('Quality factor optimization')
-        if 'optimize' in embedding_code.lower():
+        if found & SourceMarker.OPTIMIZE:
             adaptive_features.append('Optimization features')
             
         print(f"   🔧 Adaptive Features: {adaptive_features}")
@@ -311,8 +384,12 @@ analysis_data = {
 }
 
 os.makedirs("critical_analysis_results", exist_ok=True)
-with open("critical_analysis_results/why_robustness_fails.json", "w") as f:
-    json.dump(analysis_data, f, indent=2)
+with open("critical_analysis_results/why_robustness_fails.json", "wb") as f:
+    # orjson's C encoder when installed, otherwise the same indented layout from the json module
+    if orjson is not None:
+        f.write(orjson.dumps(analysis_data, option=orjson.OPT_INDENT_2))
+    else:
+        f.write(json.dumps(analysis_data, indent=2).encode('utf-8'))
 
 print(f"\n📄 Detailed analysis saved: critical_analysis_results/why_robustness_fails.json")
 print("🚀 Ready to implement critical fixes!")
\ No newline at end of file
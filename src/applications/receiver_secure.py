@@ -37,6 +37,7 @@ IDENTITY_FILE = "my_identity.json"
 HISTORY_FILE = "message_history.json"
 BROADCAST_PORT = 37020
 DISCOVERY_INTERVAL = 5
+MAX_IMAGE_SIZE = 64 * 1024 * 1024  # the image size header is unauthenticated; cap what it may allocate
 peers_list = {}
 peers_lock = threading.Lock()
 running = True
@@ -230,10 +231,25 @@ def log_message_to_history(metadata, encrypted_package_path, sender_verified):
     print(f"[+] Message logged to history (ID: {history_entry['id']})")
 
 
+def recv_exactly(conn, size):
+    """Receive size bytes straight into one preallocated buffer (shorter if the peer closes early)"""
+    buffer = bytearray(size)
+    received = 0
+    with memoryview(buffer) as view:
+        while received < size:
+            count = conn.recv_into(view[received:], size - received)
+            if not count:
+                break
+            received += count
+    del buffer[received:]
+    return buffer
+
+
 def receive_file_listener(identity, port=37021):
     """Listen for incoming secure transmissions"""
     server_sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
     server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    server_sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 1 << 20)  # 1 MB, inherited by accepted connections
     server_sock.bind(('', port))
     server_sock.listen(1)
     server_sock.settimeout(1)
@@ -266,14 +282,13 @@ def receive_file_listener(identity, port=37021):
             if len(image_size_bytes) < 4:
                 continue
             image_size = struct.unpack('!I', image_size_bytes)[0]
+            if image_size > MAX_IMAGE_SIZE:
+                print(f"[!] Rejected {image_size}-byte image from {addr[0]} (limit {MAX_IMAGE_SIZE} bytes)")
+                conn.close()
+                continue
             
             # Receive image data
-            image_data = b''
-            while len(image_data) < image_size:
-                chunk = conn.recv(min(4096, image_size - len(image_data)))
-                if not chunk:
-                    break
-                image_data += chunk
+            image_data = recv_exactly(conn, image_size)
             
             conn.close()
             
@@ -31,21 +31,95 @@ from a3_image_processing import *
 
 def bits_to_bytes(bit_string: str) -> bytes:
     """Convert bit string to bytes"""
-    # Pad to byte boundary
-    while len(bit_string) % 8 != 0:
-        bit_string += '0'
-    
-    result = bytearray()
-    for i in range(0, len(bit_string), 8):
-        byte_bits = bit_string[i:i+8]
-        result.append(int(byte_bits, 2))
-    
-    return bytes(result)
+    # packbits zero-pads the last byte to the byte boundary
+    return np.packbits(_bit_array(bit_string)).tobytes()
 
 
 def bytes_to_bits(data: bytes) -> str:
     """Convert bytes to bit string"""
-    return ''.join(format(byte, '08b') for byte in data)
+    return _bit_string(np.unpackbits(np.frombuffer(data, dtype=np.uint8)))
+
+
+def _bit_array(bit_string: str) -> np.ndarray:
+    """'0'/'1' string -> uint8 array of 0/1"""
+    return np.frombuffer(bit_string.encode('ascii'), dtype=np.uint8) - ord('0')
+
+
+def _bit_string(bits: np.ndarray) -> str:
+    """uint8 array of 0/1 -> '0'/'1' string"""
+    return (bits.astype(np.uint8) + ord('0')).tobytes().decode('ascii')
+
+
+def _quantize_bits(coeffs: np.ndarray, bits: np.ndarray, Q: float) -> np.ndarray:
+    """
+    Vectorized parity quantization of a batch of coefficients.
+    Even quantization level encodes 0, odd level encodes 1; a wrong parity
+    is fixed by stepping one level away from zero.
+    """
+    quantized = Q * np.round(coeffs / Q)
+    q_level = np.round(quantized / Q)
+    wrong_parity = (q_level % 2) != bits
+    return np.where(wrong_parity, quantized + np.where(quantized >= 0, Q, -Q), quantized)
+
+
+def _fixed_position_groups(bands: Dict[str, np.ndarray], band_names: List[str], count: int):
+    """
+    Fixed positional selection as per-band index arrays.
+    Coefficients with row, col >= 8, row-major within each band, bands in the
+    given order. Returns ([(band_name, rows, cols), ...] covering the first
+    `count` positions, total available positions).
+    """
+    groups = []
+    available = 0
+    for band_name in band_names:
+        if band_name not in bands:
+            continue
+        rows, cols = bands[band_name].shape[:2]
+        width = max(cols - 8, 0)
+        size = max(rows - 8, 0) * width
+        take = min(size, count - min(available, count))
+        available += size
+        if take > 0:
+            idx = np.arange(take)
+            groups.append((band_name, 8 + idx // width, 8 + idx % width))
+    return groups, available
+
+
+def _group_positions(coefficients: List[Tuple]) -> List[Tuple]:
+    """Collapse a (band_name, row, col) list into runs of per-band index arrays, keeping order"""
+    groups = []
+    start = 0
+    for end in range(1, len(coefficients) + 1):
+        if end == len(coefficients) or coefficients[end][0] != coefficients[start][0]:
+            run = coefficients[start:end]
+            groups.append((run[0][0], np.array([c[1] for c in run]), np.array([c[2] for c in run])))
+            start = end
+    return groups
+
+
+def _color_position_groups(bands: Dict[str, np.ndarray], band_names: List[str], count: int):
+    """
+    Color positional selection as per-band index arrays.
+    Order is row, column, then channel; coefficients with row < 8 and col < 8
+    are skipped. Returns ([(band_name, rows, cols, channels), ...] covering the
+    first `count` positions, number of positions found (capped at count)).
+    """
+    groups = []
+    found = 0
+    for band_name in band_names:
+        if found >= count:
+            break
+        if band_name not in bands:
+            continue
+        band = bands[band_name]
+        rows, cols, channels = band.shape
+        usable = np.ones((rows, cols), dtype=bool)
+        usable[:8, :8] = False
+        flat = np.flatnonzero(np.broadcast_to(usable[:, :, None], band.shape))[:count - found]
+        if len(flat):
+            groups.append((band_name,) + np.unravel_index(flat, band.shape))
+            found += len(flat)
+    return groups, found
 
 
 def embed_in_dwt_bands(payload_bits: str, bands: Dict[str, np.ndarray], 
@@ -117,23 +191,19 @@ def embed_in_dwt_bands(payload_bits: str, bands: Dict[str, np.ndarray],
             # ACO-optimized selection (robustness-based)
             all_coefficients = optimize_coefficients_aco(bands, len(payload_bits))
             print(f"Using {len(all_coefficients)} coefficients (ACO-optimized)")
+        position_groups = _group_positions(all_coefficients[:len(payload_bits)])
+        available = len(all_coefficients)
     
     else:  # fixed (default)
         # Fixed positional selection - deterministic and simple
-        all_coefficients = []
-        for band_name in embed_bands:
-            if band_name in bands:
-                band = bands[band_name]
-                # Skip first 8 rows/cols (reduced from 16 for higher capacity)
-                # Still avoids edge artifacts while maximizing usable area
-                for i in range(8, band.shape[0]):
-                    for j in range(8, band.shape[1]):
-                        all_coefficients.append((band_name, i, j))
+        # Skip first 8 rows/cols (reduced from 16 for higher capacity)
+        # Still avoids edge artifacts while maximizing usable area
+        position_groups, available = _fixed_position_groups(bands, embed_bands, len(payload_bits))
         
-        print(f"Using {len(payload_bits)} coefficients (rows,cols >= 8) from {len(all_coefficients)} available")
+        print(f"Using {len(payload_bits)} coefficients (rows,cols >= 8) from {available} available")
     
-    if len(all_coefficients) < len(payload_bits):
-        raise ValueError(f"Not enough coefficients. Need {len(payload_bits)}, found {len(all_coefficients)}")
+    if available < len(payload_bits):
+        raise ValueError(f"Not enough coefficients. Need {len(payload_bits)}, found {available}")
     
     # Create modified bands
     modified_bands = {}
@@ -150,25 +220,13 @@ def embed_in_dwt_bands(payload_bits: str, bands: Dict[str, np.ndarray],
     
     print(f"Using Q={Q} for {payload_bytes} bytes payload")
     
-    for i, bit in enumerate(payload_bits):
-        band_name, row, col = all_coefficients[i]
-        original_coeff = modified_bands[band_name][row, col]
-        
-        # Quantize coefficient
-        quantized = Q * round(original_coeff / Q)
-        
-        if bit == '1':
-            # Ensure odd quantization level
-            q_level = round(quantized / Q)
-            if q_level % 2 == 0:
-                quantized = quantized + Q if quantized >= 0 else quantized - Q
-        else:  # bit == '0'
-            # Ensure even quantization level
-            q_level = round(quantized / Q)
-            if q_level % 2 == 1:
-                quantized = quantized + Q if quantized >= 0 else quantized - Q
-        
-        modified_bands[band_name][row, col] = quantized
+    # Quantize each band's selected coefficients in one gather/scatter
+    bits = _bit_array(payload_bits)
+    start = 0
+    for band_name, rows, cols in position_groups:
+        band = modified_bands[band_name]
+        band[rows, cols] = _quantize_bits(band[rows, cols], bits[start:start + len(rows)], Q)
+        start += len(rows)
     
     return modified_bands
     
@@ -257,39 +315,33 @@ def extract_from_dwt_bands(bands: Dict[str, np.ndarray], payload_bit_length: int
         else:  # aco
             all_coefficients = optimize_coefficients_aco(bands, payload_bit_length)
             print(f"Extracting from {len(all_coefficients)} coefficients (ACO-optimized)")
+        position_groups = _group_positions(all_coefficients[:payload_bit_length])
+        available = len(all_coefficients)
     
     else:  # fixed (default)
         # Fixed positional selection
-        all_coefficients = []
-        for band_name in embed_bands:
-            if band_name in bands:
-                band = bands[band_name]
-                # Skip first 8 rows/cols - MUST match embedding threshold
-                for i in range(8, band.shape[0]):
-                    for j in range(8, band.shape[1]):
-                        all_coefficients.append((band_name, i, j))
+        # Skip first 8 rows/cols - MUST match embedding threshold
+        position_groups, available = _fixed_position_groups(bands, embed_bands, payload_bit_length)
         
         print(f"Extracting from {payload_bit_length} coefficients (rows,cols >= 8)")
     
-    if len(all_coefficients) < payload_bit_length:
-        raise ValueError(f"Not enough coefficients for extraction: {len(all_coefficients)} < {payload_bit_length}")
+    if available < payload_bit_length:
+        raise ValueError(f"Not enough coefficients for extraction: {available} < {payload_bit_length}")
     
     # Use provided Q_factor (MUST match embedding!)
     Q = Q_factor
     
     print(f"Using Q={Q} for extraction")
     
-    # Extract using same quantization as embedding
-    extracted_bits = []
-    
-    for i in range(payload_bit_length):
-        band_name, row, col = all_coefficients[i]
-        coeff = bands[band_name][row, col]
-        
-        q_level = round(coeff / Q)
-        extracted_bits.append('1' if q_level % 2 == 1 else '0')
+    # Extract using same quantization as embedding (odd level = 1, even = 0)
+    extracted_bits = np.empty(payload_bit_length, dtype=np.uint8)
+    start = 0
+    for band_name, rows, cols in position_groups:
+        q_level = np.round(bands[band_name][rows, cols] / Q)
+        extracted_bits[start:start + len(rows)] = q_level % 2 == 1
+        start += len(rows)
     
-    return ''.join(extracted_bits)
+    return _bit_string(extracted_bits)
 
 
 def embed(payload: bytes, cover_path: str, stego_path: str, optimization: str = 'fixed') -> bool:
@@ -538,58 +590,28 @@ def embed_in_dwt_bands_color(payload_bits: str, bands: Dict[str, np.ndarray],
     # ROBUSTNESS FIX: Low frequency first (same as grayscale)
     embed_bands_list = ['LL2', 'HL2', 'LH2', 'HL1', 'LH1', 'HH2', 'HH1']
     
-    # Collect all embedding positions across all channels (deterministic order)
-    positions = []
-    for band_name in embed_bands_list:
-        if band_name not in bands:
-            continue
-        band = bands[band_name]
-        rows, cols, channels = band.shape
-        
-        # Deterministic order: row by row, column by column, then channel
-        for i in range(rows):
-            for j in range(cols):
-                for c in range(channels):  # B, G, R channels
-                    # Check if coefficient has sufficient magnitude
-                    if i >= 8 or j >= 8:  # Skip first 8 rows/cols (similar to grayscale)
-                        positions.append((band_name, i, j, c))
-                        if len(positions) >= len(payload_bits):
-                            break
-                if len(positions) >= len(payload_bits):
-                    break
-            if len(positions) >= len(payload_bits):
-                break
-        if len(positions) >= len(payload_bits):
-            break
+    # Collect all embedding positions across all channels (deterministic order):
+    # row by row, column by column, then channel (B, G, R), skipping the first
+    # 8x8 corner (similar to grayscale)
+    position_groups, found = _color_position_groups(bands, embed_bands_list, len(payload_bits))
     
-    if len(positions) < len(payload_bits):
-        raise ValueError(f"Insufficient capacity: need {len(payload_bits)}, have {len(positions)}")
+    if found < len(payload_bits):
+        raise ValueError(f"Insufficient capacity: need {len(payload_bits)}, have {found}")
     
-    print(f"[Color Mode: Using {len(positions)} coefficients across 3 RGB channels]")
+    print(f"[Color Mode: Using {found} coefficients across 3 RGB channels]")
     print(f"Embedding {len(payload_bits)} bits with Q={Q_factor}")
     
     # Create modified bands (deep copy)
     modified_bands = {k: v.copy() if isinstance(v, np.ndarray) else v for k, v in bands.items()}
     
-    # Embed using quantization
-    for idx, bit in enumerate(payload_bits):
-        band_name, row, col, channel = positions[idx]
-        coeff = modified_bands[band_name][row, col, channel]
-        
-        # Quantize
-        Q = Q_factor
-        quantized = Q * round(coeff / Q)
-        
-        if bit == '1':
-            q_level = round(quantized / Q)
-            if q_level % 2 == 0:
-                quantized = quantized + Q if quantized >= 0 else quantized - Q
-        else:
-            q_level = round(quantized / Q)
-            if q_level % 2 == 1:
-                quantized = quantized + Q if quantized >= 0 else quantized - Q
-        
-        modified_bands[band_name][row, col, channel] = quantized
+    # Embed using quantization, one gather/scatter per band
+    bits = _bit_array(payload_bits)
+    start = 0
+    for band_name, rows, cols, channels in position_groups:
+        band = modified_bands[band_name]
+        band[rows, cols, channels] = _quantize_bits(band[rows, cols, channels],
+                                                    bits[start:start + len(rows)], Q_factor)
+        start += len(rows)
     
     return modified_bands
 
@@ -611,47 +633,27 @@ def extract_from_dwt_bands_color(bands: Dict[str, np.ndarray], payload_bit_lengt
     embed_bands_list = ['LL2', 'HL2', 'LH2', 'HL1', 'LH1', 'HH2', 'HH1']
     
     # Collect extraction positions (EXACT SAME ORDER as embedding)
-    positions = []
-    for band_name in embed_bands_list:
-        if band_name not in bands:
-            continue
-        band = bands[band_name]
-        rows, cols, channels = band.shape
-        
-        # Same deterministic order
-        for i in range(rows):
-            for j in range(cols):
-                for c in range(channels):
-                    if i >= 8 or j >= 8:  # Must match embedding condition exactly
-                        positions.append((band_name, i, j, c))
-                        if len(positions) >= payload_bit_length:
-                            break
-                if len(positions) >= payload_bit_length:
-                    break
-            if len(positions) >= payload_bit_length:
-                break
-        if len(positions) >= payload_bit_length:
-            break
+    position_groups, found = _color_position_groups(bands, embed_bands_list, payload_bit_length)
+    if found < payload_bit_length:
+        raise ValueError(f"Insufficient capacity: need {payload_bit_length}, have {found}")
     
-    print(f"[Color Mode: Extracting from {len(positions)} RGB coefficients]")
+    print(f"[Color Mode: Extracting from {found} RGB coefficients]")
     print(f"Using Q={Q_factor} for extraction")
     
     # Extract bits
-    extracted_bits = ""
-    for idx in range(payload_bit_length):
-        band_name, row, col, channel = positions[idx]
-        coeff = bands[band_name][row, col, channel]
-        
+    extracted_bits = np.empty(payload_bit_length, dtype=np.uint8)
+    start = 0
+    for band_name, rows, cols, channels in position_groups:
         # Quantize and check parity
         Q = Q_factor
-        quantized = Q * round(coeff / Q)
-        q_level = round(quantized / Q)
+        quantized = Q * np.round(bands[band_name][rows, cols, channels] / Q)
+        q_level = np.round(quantized / Q)
         
         # Odd = 1, Even = 0
-        bit = '1' if (q_level % 2 == 1) else '0'
-        extracted_bits += bit
+        extracted_bits[start:start + len(rows)] = q_level % 2 == 1
+        start += len(rows)
     
-    return extracted_bits
+    return _bit_string(extracted_bits)
 
 
 if __name__ == "__main__":